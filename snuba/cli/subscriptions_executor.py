@@ -7,7 +7,7 @@ import click
 from arroyo import configure_metrics
 from arroyo.backends.kafka import KafkaProducer
 
-from snuba import environment, state
+from snuba import environment, querylog, state
 from snuba.attribution.log import flush_attribution_producer
 from snuba.datasets.entities import EntityKey
 from snuba.datasets.entities.factory import get_entity
@@ -163,7 +163,7 @@ def subscriptions_executor(
     signal.signal(signal.SIGINT, handler)
     signal.signal(signal.SIGTERM, handler)
 
-    with closing(producer), flush_querylog(), flush_attribution_producer():
+    with closing(producer), flush_attribution_producer(), flush_querylog():
         processor.run()
 
 
@@ -180,4 +180,8 @@ def flush_querylog() -> Iterator[None]:
     try:
         yield
     finally:
+        # Run the queued querylog tasks before flushing the producers they
+        # produce to. This exits before flush_attribution_producer for the
+        # same reason.
+        querylog.emitter.flush()
         state.flush_producer()
@@ -1,6 +1,6 @@
-from typing import Any, Mapping, Optional
+from functools import partial
+from typing import Any, Callable, Mapping, Optional, Tuple
 
-import sentry_sdk
 from sentry_sdk import Hub
 
 from snuba import environment, settings, state
@@ -9,37 +9,50 @@ from snuba.attribution.log import (
     QueryAttributionData,
     record_attribution,
 )
+from snuba.querylog.emitter import QueryLogEmitter, QueryLogTask
 from snuba.querylog.query_metadata import QueryStatus, SnubaQueryMetadata
 from snuba.request import Request
+from snuba.utils.metrics.backends.dummy import DummyMetricsBackend
 from snuba.utils.metrics.timer import Timer
+from snuba.utils.metrics.types import Tags
 from snuba.utils.metrics.wrapper import MetricsWrapper
 
 metrics = MetricsWrapper(environment.metrics, "api")
+emitter = QueryLogEmitter(settings.RECORD_QUERIES_QUEUE_SIZE)
+# Don't compute and send the timer metrics if the backend discards them.
+send_timer_metrics = not isinstance(environment.metrics, DummyMetricsBackend)
 
 
-def _record_timer_metrics(
-    request: Request,
-    timer: Timer,
-    query_metadata: SnubaQueryMetadata,
+def _emit(
+    query_data: Optional[Mapping[str, Any]], send_metrics: Callable[[], None]
 ) -> None:
-    final = str(request.query.get_final())
-    referrer = request.referrer or "none"
-    app_id = request.attribution_info.app_id.key or "none"
-    timer.send_metrics_to(
-        metrics,
-        tags={
-            "status": query_metadata.status.value,
-            "referrer": referrer,
-            "final": final,
-            "dataset": query_metadata.dataset,
-            "app_id": app_id,
-        },
-        mark_tags={
-            "final": final,
-            "referrer": referrer,
-            "dataset": query_metadata.dataset,
-        },
-    )
+    if settings.RECORD_QUERIES_ASYNC:
+        emitter.enqueue(QueryLogTask(query_data, send_metrics))
+    else:
+        if query_data is not None:
+            state.record_query(query_data)
+        with metrics.batch():
+            send_metrics()
+
+
+def _get_timer_metrics_tags(
+    request: Request, query_data: Mapping[str, Any]
+) -> Tuple[Tags, Tags]:
+    """
+    Builds the tags for the query timer and for its marks. The values
+    already computed by SnubaQueryMetadata.to_dict are reused.
+    """
+    mark_tags = {
+        "final": "True" if request.query.get_final() else "False",
+        "referrer": request.referrer or "none",
+        "dataset": query_data["dataset"],
+    }
+    tags = {
+        **mark_tags,
+        "status": query_data["status"],
+        "app_id": request.attribution_info.app_id.key or "none",
+    }
+    return tags, mark_tags
 
 
 def _record_attribution_metrics(
@@ -80,13 +93,21 @@ def record_query(
     we actually ran a query or not.
     """
     if settings.RECORD_QUERIES:
-        # Send to redis
         # We convert this to a dict before passing it to state in order to avoid a
         # circular dependency, where state would depend on the higher level
-        # QueryMetadata class
-        state.record_query(query_metadata.to_dict())
-        _record_timer_metrics(request, timer, query_metadata)
-        _record_attribution_metrics(request, query_metadata, extra_data)
+        # QueryMetadata class. This also stops the timer so the recorded
+        # durations do not depend on when the task is run.
+        query_data = query_metadata.to_dict()
+        tags, mark_tags = _get_timer_metrics_tags(request, query_data)
+
+        def send_metrics() -> None:
+            if send_timer_metrics:
+                timer.send_metrics_to(metrics, tags=tags, mark_tags=mark_tags)
+            _record_attribution_metrics(request, query_metadata, extra_data)
+
+        # Send to redis
+        _emit(query_data, send_metrics)
+        # The Sentry scope is bound to the request thread.
         _add_tags(timer, extra_data.get("experiments"), query_metadata)
 
 
@@ -95,20 +116,28 @@ def _add_tags(
     experiments: Optional[Mapping[str, Any]] = None,
     metadata: Optional[SnubaQueryMetadata] = None,
 ) -> None:
-    if Hub.current.scope.span:
-        duration_group = timer.get_duration_group()
-        sentry_sdk.set_tag("duration_group", duration_group)
-        if duration_group == ">30s":
-            sentry_sdk.set_tag("timeout", "too_long")
-        if experiments is not None:
-            for name, value in experiments.items():
-                sentry_sdk.set_tag(name, str(value))
-        if metadata is not None:
-            for query_data in metadata.query_list:
-                max_threads = query_data.stats.get("max_threads")
-                if max_threads is not None:
-                    sentry_sdk.set_tag("max_threads", max_threads)
-                    break
+    # Most consumers and workers never have an active span, so bail out
+    # before doing any more work.
+    scope = Hub.current.scope
+    if scope.span is None:
+        return
+
+    # Set the tags on the scope directly rather than through sentry_sdk,
+    # which looks up the current hub and scope again for every tag.
+    set_tag = scope.set_tag
+    duration_group = timer.get_duration_group()
+    set_tag("duration_group", duration_group)
+    if duration_group == ">30s":
+        set_tag("timeout", "too_long")
+    if experiments is not None:
+        for name, value in experiments.items():
+            set_tag(name, str(value))
+    if metadata is not None:
+        for query_data in metadata.query_list:
+            max_threads = query_data.stats.get("max_threads")
+            if max_threads is not None:
+                set_tag("max_threads", max_threads)
+                break
 
 
 def record_invalid_request(timer: Timer, referrer: Optional[str]) -> None:
@@ -135,8 +164,14 @@ def _record_failure_building_request(
     # TODO: Revisit if recording some data for these queries in the querylog
     # table would be useful.
     if settings.RECORD_QUERIES:
-        timer.send_metrics_to(
-            metrics,
-            tags={"status": status.value, "referrer": referrer or "none"},
-        )
+        timer.finish()
+        if send_timer_metrics:
+            _emit(
+                None,
+                partial(
+                    timer.send_metrics_to,
+                    metrics,
+                    tags={"status": status.value, "referrer": referrer or "none"},
+                ),
+            )
         _add_tags(timer)
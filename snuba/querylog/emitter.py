@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, MutableSequence, Optional, Tuple
+
+from snuba import environment, state
+from snuba.utils.metrics.wrapper import MetricsWrapper
+
+logger = logging.getLogger("snuba.querylog")
+metrics = MetricsWrapper(environment.metrics, "api.querylog")
+
+
+@dataclass(frozen=True)
+class QueryLogTask:
+    """
+    The querylog entry of a request, if there is one to write to Redis and
+    Kafka, and the function that sends the metrics for the request.
+    """
+
+    query: Optional[Mapping[str, Any]]
+    send_metrics: Callable[[], None]
+
+
+class QueryLogEmitter:
+    """
+    Runs the querylog tasks (recording the query in Redis and Kafka and
+    sending its metrics) on a background thread, so that the API request
+    that produced them does not have to wait for them.
+
+    Tasks are buffered in a bounded queue. If the queue is full the task is
+    dropped instead of blocking the request thread. The thread takes the
+    queued tasks in batches and records all the queries of a batch through
+    a single Redis pipeline.
+    """
+
+    def __init__(self, max_queue_size: int, max_batch_size: int = 100) -> None:
+        # ``None`` is the sentinel that stops the background thread.
+        self.__queue: queue.Queue[Optional[QueryLogTask]] = queue.Queue(max_queue_size)
+        self.__max_batch_size = max_batch_size
+        self.__lock = threading.Lock()
+        # The thread is started lazily and restarted if the process forked,
+        # since threads do not survive a fork (uWSGI workers are forked from
+        # the master process after the application is loaded.)
+        self.__thread: Optional[threading.Thread] = None
+        self.__pid: Optional[int] = None
+        # Set while flush is stopping the thread, so that a concurrent
+        # enqueue does not start another one that could take the sentinel.
+        self.__stopping = False
+
+    def __is_running(self, pid: int) -> bool:
+        return (
+            self.__thread is not None and self.__pid == pid and self.__thread.is_alive()
+        )
+
+    def __ensure_started(self) -> None:
+        pid = os.getpid()
+        if self.__is_running(pid):
+            return
+
+        with self.__lock:
+            # The tasks queued while a flush is in progress are run by it.
+            if not self.__stopping and not self.__is_running(pid):
+                self.__thread = threading.Thread(
+                    target=self.__drain_loop, name="querylog-emitter", daemon=True
+                )
+                self.__thread.start()
+                self.__pid = pid
+                atexit.register(self.flush)
+
+    def enqueue(self, task: QueryLogTask) -> None:
+        self.__ensure_started()
+        try:
+            self.__queue.put_nowait(task)
+        except queue.Full:
+            metrics.increment("dropped")
+
+    def __get_batch(self) -> Tuple[MutableSequence[QueryLogTask], bool]:
+        """
+        Waits for the next batch of tasks. Also returns whether the stop
+        sentinel was received, in which case the thread has to exit once it
+        has run the batch.
+        """
+        task = self.__queue.get()
+        if task is None:
+            return [], True
+
+        batch = [task]
+        while len(batch) < self.__max_batch_size:
+            try:
+                task = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            if task is None:
+                return batch, True
+            batch.append(task)
+        return batch, False
+
+    def __run(self, batch: MutableSequence[QueryLogTask]) -> None:
+        if not batch:
+            return
+
+        queries = [task.query for task in batch if task.query is not None]
+        if queries:
+            state.record_queries(queries)
+
+        with metrics.batch():
+            for task in batch:
+                try:
+                    task.send_metrics()
+                except Exception as ex:
+                    logger.exception("Could not record query due to error: %r", ex)
+
+    def __drain_loop(self) -> None:
+        stopped = False
+        while not stopped:
+            batch, stopped = self.__get_batch()
+            self.__run(batch)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """
+        Stops the background thread, waiting up to ``timeout`` seconds for
+        it to finish the batch it is running, then runs the tasks still in
+        the queue on the calling thread. The thread is started again by the
+        next call to ``enqueue``.
+        """
+        with self.__lock:
+            self.__stopping = True
+            running = self.__is_running(os.getpid())
+            thread = self.__thread
+
+        try:
+            if running and thread is not None:
+                try:
+                    self.__queue.put(None, timeout=timeout)
+                except queue.Full:
+                    logger.warning("Could not stop the querylog emitter, queue is full")
+                else:
+                    thread.join(timeout)
+
+            atexit.unregister(self.flush)
+
+            batch = []
+            while True:
+                try:
+                    task = self.__queue.get_nowait()
+                except queue.Empty:
+                    break
+                if task is not None:
+                    batch.append(task)
+            self.__run(batch)
+        finally:
+            with self.__lock:
+                self.__stopping = False
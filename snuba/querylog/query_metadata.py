@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Mapping, MutableSequence, Optional, Set
+from typing import Any, Dict, Mapping, MutableSequence, Optional, Sequence, Set
 
 from snuba.request import Request
 from snuba.utils.metrics.timer import Timer
@@ -97,6 +97,24 @@ class SnubaQueryMetadata:
     Metadata about a Snuba query for recording on the querylog dataset.
     """
 
+    # One instance is created for every query, don't give each of them a
+    # __dict__. The fields must not have defaults, since a default would be
+    # a class attribute conflicting with its slot. Without a __dict__, copy
+    # and pickle restore the fields with setattr, which the frozen dataclass
+    # rejects, so __getstate__ and __setstate__ are defined below the same
+    # way dataclass(slots=True) does from Python 3.10.
+    __slots__ = (
+        "request",
+        "start_timestamp",
+        "end_timestamp",
+        "dataset",
+        "entity",
+        "timer",
+        "query_list",
+        "projects",
+        "snql_anonymized",
+    )
+
     request: Request
     start_timestamp: Optional[datetime]
     end_timestamp: Optional[datetime]
@@ -107,6 +125,13 @@ class SnubaQueryMetadata:
     projects: Set[int]
     snql_anonymized: str
 
+    def __getstate__(self) -> Sequence[Any]:
+        return [getattr(self, f.name) for f in fields(self)]
+
+    def __setstate__(self, state: Sequence[Any]) -> None:
+        for f, value in zip(fields(self), state):
+            object.__setattr__(self, f.name, value)
+
     def to_dict(self) -> Dict[str, Any]:
         start = int(self.start_timestamp.timestamp()) if self.start_timestamp else None
         end = int(self.end_timestamp.timestamp()) if self.end_timestamp else None
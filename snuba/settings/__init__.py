@@ -92,6 +92,10 @@ USE_RESULT_CACHE = True
 
 # Query Recording Options
 RECORD_QUERIES = False
+# Record queries and their metrics from a background thread instead of the
+# API request thread. Queries are dropped once the queue is full.
+RECORD_QUERIES_ASYNC = True
+RECORD_QUERIES_QUEUE_SIZE = 10000
 
 # Runtime Config Options
 CONFIG_MEMOIZE_TIMEOUT = 10
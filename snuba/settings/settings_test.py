@@ -9,6 +9,7 @@ STATS_IN_RESPONSE = True
 CONFIG_MEMOIZE_TIMEOUT = 0
 
 RECORD_QUERIES = True
+RECORD_QUERIES_ASYNC = False
 USE_RESULT_CACHE = True
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
@@ -330,19 +330,33 @@ def _record_query_delivery_callback(
 
 
 def record_query(query_metadata: Mapping[str, Any]) -> None:
+    record_queries([query_metadata])
+
+
+def record_queries(queries: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Records a batch of queries with a single Redis pipeline.
+    """
     max_redis_queries = 200
+    # Encode once, both Redis and Kafka take the same bytes.
+    data = []
+    for query_metadata in queries:
+        try:
+            data.append(safe_dumps(query_metadata).encode("utf-8"))
+        except Exception as ex:
+            logger.exception("Could not record query due to error: %r", ex)
+    if not data:
+        return
+
     try:
         producer = _kafka_producer()
-        data = safe_dumps(query_metadata)
-        rds.pipeline(transaction=False).lpush(queries_list, data).ltrim(  # type: ignore
+        rds.pipeline(transaction=False).lpush(queries_list, *data).ltrim(  # type: ignore
             queries_list, 0, max_redis_queries - 1
         ).execute()
         producer.poll(0)  # trigger queued delivery callbacks
-        producer.produce(
-            settings.KAFKA_TOPIC_MAP.get(Topic.QUERYLOG.value, Topic.QUERYLOG.value),
-            data.encode("utf-8"),
-            on_delivery=_record_query_delivery_callback,
-        )
+        topic = settings.KAFKA_TOPIC_MAP.get(Topic.QUERYLOG.value, Topic.QUERYLOG.value)
+        for value in data:
+            producer.produce(topic, value, on_delivery=_record_query_delivery_callback)
     except Exception as ex:
         logger.exception("Could not record query due to error: %r", ex)
 
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Union
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
 
 from snuba.utils.metrics.types import Tags
 
@@ -50,3 +51,18 @@ class MetricsBackend(ABC):
         metrics.timing("request.latency", request_latency_in_ms)
         """
         raise NotImplementedError
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group all the metrics recorded within the block so that backends
+        that support it can send them together rather than one at a time.
+        By default metrics are sent as they are recorded.
+
+        Example:
+
+        with metrics.batch():
+            metrics.timing("request.latency", request_latency_in_ms)
+            metrics.increment("request.count")
+        """
+        yield
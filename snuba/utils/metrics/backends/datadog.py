@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import threading
-from typing import Callable, Mapping, Optional, Union
+from contextlib import contextmanager
+from typing import Callable, Iterator, Mapping, Optional, Union
 
 from datadog.dogstatsd.base import DogStatsd
 
@@ -77,3 +78,10 @@ class DatadogMetricsBackend(MetricsBackend):
             tags=self.__normalize_tags(tags),
             sample_rate=self.__sample_rates.get(name, 1.0),
         )
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        # The client buffers everything recorded while the buffer is open
+        # and flushes it in as few packets as possible once it is closed.
+        with self.__client:
+            yield
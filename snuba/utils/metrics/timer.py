@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from itertools import groupby
 from typing import Mapping, MutableSequence, Optional, Tuple, TypedDict
 
@@ -5,6 +6,10 @@ from snuba.utils.clock import Clock, SystemClock
 from snuba.utils.metrics.backends.abstract import MetricsBackend
 from snuba.utils.metrics.types import Tags
 
+# A duration falls in the group following the last threshold it reaches.
+DURATION_GROUP_THRESHOLDS_MS = (10000, 20000, 30000)
+DURATION_GROUPS = ("<10s", ">10s", ">20s", ">30s")
+
 
 class TimerData(TypedDict):
     timestamp: int
@@ -40,16 +45,9 @@ class Timer:
         if self.__data is None:
             return "unknown"
 
-        duration_ms = self.__data["duration_ms"]
-        duration_group = "<10s"
-        if duration_ms >= 30000:
-            duration_group = ">30s"
-        elif duration_ms >= 20000:
-            duration_group = ">20s"
-        elif duration_ms >= 10000:
-            duration_group = ">10s"
-
-        return duration_group
+        return DURATION_GROUPS[
+            bisect_right(DURATION_GROUP_THRESHOLDS_MS, self.__data["duration_ms"])
+        ]
 
     def finish(self) -> TimerData:
         if self.__data is None:
@@ -84,8 +82,6 @@ class Timer:
         data = self.finish()
         merged_tags = {**data["tags"], **tags} if tags else self.__tags
         backend.timing(self.__name, data["duration_ms"], tags=merged_tags)
+        merged_mark_tags = {**data["tags"], **mark_tags} if mark_tags else data["tags"]
         for mark, duration in data["marks_ms"].items():
-            merged_mark_tags = (
-                {**data["tags"], **mark_tags} if mark_tags else data["tags"]
-            )
             backend.timing(f"{self.__name}.{mark}", duration, tags=merged_mark_tags)
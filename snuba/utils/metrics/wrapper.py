@@ -1,5 +1,6 @@
 from collections import ChainMap
-from typing import Optional, Union
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
 
 from snuba.utils.metrics.backends.abstract import MetricsBackend
 from snuba.utils.metrics.types import Tags
@@ -46,3 +47,8 @@ class MetricsWrapper(MetricsBackend):
         self, name: str, value: Union[int, float], tags: Optional[Tags] = None
     ) -> None:
         self.__backend.timing(self.__merge_name(name), value, self.__merge_tags(tags))
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self.__backend.batch():
+            yield
@@ -0,0 +1,83 @@
+from threading import Event
+from typing import MutableSequence
+from unittest.mock import MagicMock, patch
+
+from snuba.querylog.emitter import QueryLogEmitter, QueryLogTask
+from snuba.utils.metrics.backends.testing import (
+    clear_recorded_metric_calls,
+    get_recorded_metric_calls,
+)
+
+# Every test flushes its emitter when it is done, which stops the
+# background thread and unregisters the atexit handler.
+
+
+def test_emitter_runs_tasks() -> None:
+    emitter = QueryLogEmitter(max_queue_size=10)
+    done = Event()
+    emitter.enqueue(QueryLogTask(None, done.set))
+    assert done.wait(timeout=5)
+    emitter.flush()
+
+
+@patch("snuba.state.record_queries")
+def test_emitter_records_batch_of_queries(record_queries_mock: MagicMock) -> None:
+    emitter = QueryLogEmitter(max_queue_size=10)
+    started = Event()
+    unblock = Event()
+
+    def blocking() -> None:
+        started.set()
+        unblock.wait(timeout=5)
+
+    # Keep the background thread busy so both queries end up in one batch.
+    emitter.enqueue(QueryLogTask(None, blocking))
+    assert started.wait(timeout=5)
+
+    calls: MutableSequence[int] = []
+    emitter.enqueue(QueryLogTask({"id": 1}, lambda: calls.append(1)))
+    emitter.enqueue(QueryLogTask({"id": 2}, lambda: calls.append(2)))
+    unblock.set()
+    emitter.flush()
+
+    record_queries_mock.assert_called_once_with([{"id": 1}, {"id": 2}])
+    assert calls == [1, 2]
+
+
+def test_emitter_drops_tasks_when_full() -> None:
+    clear_recorded_metric_calls()
+    emitter = QueryLogEmitter(max_queue_size=1)
+    started = Event()
+    unblock = Event()
+
+    def blocking() -> None:
+        started.set()
+        unblock.wait(timeout=5)
+
+    # Keep the background thread busy so the queue can fill up.
+    emitter.enqueue(QueryLogTask(None, blocking))
+    assert started.wait(timeout=5)
+
+    calls: MutableSequence[int] = []
+    emitter.enqueue(QueryLogTask(None, lambda: calls.append(1)))
+    emitter.enqueue(QueryLogTask(None, lambda: calls.append(2)))
+    unblock.set()
+    emitter.flush()
+
+    assert calls == [1]
+    metric_calls = get_recorded_metric_calls("increment", "api.querylog.dropped")
+    assert metric_calls is not None
+    assert len(metric_calls) == 1
+
+
+def test_emitter_restarts_after_flush() -> None:
+    emitter = QueryLogEmitter(max_queue_size=10)
+    first = Event()
+    emitter.enqueue(QueryLogTask(None, first.set))
+    emitter.flush()
+    assert first.is_set()
+
+    second = Event()
+    emitter.enqueue(QueryLogTask(None, second.set))
+    assert second.wait(timeout=5)
+    emitter.flush()
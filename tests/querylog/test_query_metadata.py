@@ -0,0 +1,48 @@
+import copy
+import uuid
+from datetime import datetime
+
+from snuba.attribution import get_app_id
+from snuba.attribution.attribution_info import AttributionInfo
+from snuba.datasets.entities import EntityKey
+from snuba.datasets.entities.factory import get_entity
+from snuba.query.data_source.simple import Entity
+from snuba.query.logical import Query
+from snuba.query.query_settings import HTTPQuerySettings
+from snuba.querylog.query_metadata import SnubaQueryMetadata
+from snuba.request import Request
+from snuba.utils.clock import TestingClock
+from snuba.utils.metrics.timer import Timer
+
+
+def test_copy() -> None:
+    request = Request(
+        id=uuid.UUID("a" * 32).hex,
+        original_body={"project": 1},
+        query=Query(
+            Entity(EntityKey.EVENTS, get_entity(EntityKey.EVENTS).get_data_model())
+        ),
+        snql_anonymized="",
+        query_settings=HTTPQuerySettings(referrer="search"),
+        attribution_info=AttributionInfo(
+            get_app_id("default"), "search", None, None, None
+        ),
+    )
+    metadata = SnubaQueryMetadata(
+        request=request,
+        start_timestamp=datetime(2022, 1, 1),
+        end_timestamp=datetime(2022, 1, 2),
+        dataset="events",
+        entity=EntityKey.EVENTS.value,
+        timer=Timer("test", clock=TestingClock()),
+        query_list=[],
+        projects={1},
+        snql_anonymized="",
+    )
+
+    shallow = copy.copy(metadata)
+    assert shallow == metadata
+    assert shallow.request is metadata.request
+
+    deep = copy.deepcopy(metadata)
+    assert deep.to_dict() == metadata.to_dict()
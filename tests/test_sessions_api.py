@@ -1,10 +1,10 @@
 import itertools
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Mapping, Sequence, Tuple, Union
 
 import pytest
-import pytz
-import simplejson as json
+import rapidjson
 
 from snuba import settings
 from snuba.consumers.types import KafkaMessageMetadata
@@ -15,12 +15,37 @@ from snuba.utils.metrics.backends.dummy import DummyMetricsBackend
 from tests.base import BaseApiTest
 from tests.helpers import write_processed_messages
 
+# The format ClickHouse expects for DateTime values in JSONEachRow rows.
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# The part of the legacy sessions query body that does not change between
+# tests, they fill in the project and the time range.
+SESSIONS_QUERY: Mapping[str, Any] = {
+    "dataset": "sessions",
+    "organization": 1,
+    "selected_columns": [
+        "sessions",
+        "sessions_errored",
+        "users",
+        "users_errored",
+    ],
+}
+
 
 class BaseSessionsMockTest:
     started = datetime.utcnow().replace(
-        minute=0, second=0, microsecond=0, tzinfo=pytz.utc
+        minute=0, second=0, microsecond=0, tzinfo=timezone.utc
     )
     storage = get_writable_storage(StorageKey.SESSIONS_RAW)
+    # Fields shared by every session generated in these tests.
+    session_template: Mapping[str, Any] = {
+        "environment": "production",
+        "org_id": 1,
+        "release": "sentry-test@1.0.0",
+        "retention_days": settings.DEFAULT_RETENTION_DAYS,
+        "seq": 0,
+        "errors": 0,
+    }
 
     def generate_manual_session_events(self, project_id: int) -> None:
         session_1 = "b3ef3211-58a4-4b36-a9a1-5a55df0d9aae"
@@ -29,16 +54,11 @@ class BaseSessionsMockTest:
         user_2 = "b3ef3211-58a4-4b36-a9a1-5a55df0d9aaf"
 
         template = {
+            **self.session_template,
             "duration": MAX_UINT32,
-            "environment": "production",
-            "org_id": 1,
             "project_id": project_id,
-            "release": "sentry-test@1.0.0",
-            "retention_days": settings.DEFAULT_RETENTION_DAYS,
-            "seq": 0,
-            "errors": 0,
-            "received": datetime.now().isoformat(" ", "seconds"),
-            "started": self.started.replace(tzinfo=None).isoformat(" ", "seconds"),
+            "received": time.strftime(DATETIME_FORMAT),
+            "started": self.started.strftime(DATETIME_FORMAT),
         }
 
         sessions: Sequence[Mapping[str, Any]] = [
@@ -64,7 +84,7 @@ class BaseSessionsMockTest:
 
         self.storage.get_table_writer().get_batch_writer(
             metrics=DummyMetricsBackend(strict=True)
-        ).write([json.dumps(session).encode("utf-8") for session in sessions])
+        ).write(rapidjson.dumps(session).encode("utf-8") for session in sessions)
 
 
 class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
@@ -93,8 +113,10 @@ class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
         self.minutes = 180
         self.skew = timedelta(minutes=self.minutes)
         self.started = datetime.utcnow().replace(
-            minute=0, second=0, microsecond=0, tzinfo=pytz.utc
+            minute=0, second=0, microsecond=0, tzinfo=timezone.utc
         )
+        self.from_date = (self.started - self.skew).isoformat()
+        self.to_date = (self.started + self.skew).isoformat()
 
         self.storage = get_writable_storage(StorageKey.SESSIONS_RAW)
 
@@ -104,23 +126,16 @@ class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
         project_id = get_project_id()
         self.generate_manual_session_events(project_id)
         response = self.post(
-            json.dumps(
+            rapidjson.dumps(
                 {
-                    "dataset": "sessions",
-                    "organization": 1,
+                    **SESSIONS_QUERY,
                     "project": project_id,
-                    "selected_columns": [
-                        "sessions",
-                        "sessions_errored",
-                        "users",
-                        "users_errored",
-                    ],
-                    "from_date": (self.started - self.skew).isoformat(),
-                    "to_date": (self.started + self.skew).isoformat(),
+                    "from_date": self.from_date,
+                    "to_date": self.to_date,
                 }
             ),
         )
-        data = json.loads(response.data)
+        data = rapidjson.loads(response.data)
         assert response.status_code == 200, response.data
         assert len(data["data"]) == 1, data
         assert data["data"][0]["sessions"] == 20
@@ -134,16 +149,11 @@ class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
             offset=1, partition=2, timestamp=datetime(1970, 1, 1)
         )
         template = {
+            **self.session_template,
             "session_id": "00000000-0000-0000-0000-000000000000",
             "distinct_id": "b3ef3211-58a4-4b36-a9a1-5a55df0d9aaf",
             "duration": None,
-            "environment": "production",
-            "org_id": 1,
             "project_id": project_id,
-            "release": "sentry-test@1.0.0",
-            "retention_days": settings.DEFAULT_RETENTION_DAYS,
-            "seq": 0,
-            "errors": 0,
             "received": datetime.utcnow().timestamp(),
             "started": self.started.timestamp(),
         }
@@ -185,23 +195,16 @@ class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
         project_id = get_project_id()
         self.generate_session_events(project_id)
         response = self.post(
-            json.dumps(
+            rapidjson.dumps(
                 {
-                    "dataset": "sessions",
-                    "organization": 1,
+                    **SESSIONS_QUERY,
                     "project": project_id,
-                    "selected_columns": [
-                        "sessions",
-                        "sessions_errored",
-                        "users",
-                        "users_errored",
-                    ],
-                    "from_date": (self.started - self.skew).isoformat(),
-                    "to_date": (self.started + self.skew).isoformat(),
+                    "from_date": self.from_date,
+                    "to_date": self.to_date,
                 }
             ),
         )
-        data = json.loads(response.data)
+        data = rapidjson.loads(response.data)
         assert response.status_code == 200, response.data
 
         assert len(data["data"]) == 1, data
@@ -219,7 +222,7 @@ class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
         project_id = get_project_id()
         self.generate_session_events(project_id)
         response = self.post(
-            json.dumps(
+            rapidjson.dumps(
                 {
                     "dataset": "sessions",
                     "organization": 1,
@@ -234,12 +237,12 @@ class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
                     "groupby": ["bucketed_started"],
                     "orderby": ["bucketed_started"],
                     "granularity": granularity,
-                    "from_date": (self.started - self.skew).isoformat(),
-                    "to_date": (self.started + self.skew).isoformat(),
+                    "from_date": self.from_date,
+                    "to_date": self.to_date,
                 }
             ),
         )
-        data = json.loads(response.data)
+        data = rapidjson.loads(response.data)
         assert response.status_code == 200, response.data
 
         assert len(data["data"]) == 3, data
@@ -260,7 +263,7 @@ class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
         project_id = get_project_id()
         self.generate_session_events(project_id)
         response = self.post(
-            json.dumps(
+            rapidjson.dumps(
                 {
                     "dataset": "sessions",
                     "organization": 1,
@@ -274,7 +277,7 @@ class TestLegacySessionsApi(BaseSessionsMockTest, BaseApiTest):
                 }
             ),
         )
-        data = json.loads(response.data)
+        data = rapidjson.loads(response.data)
         assert response.status_code == 400, response.data
 
         assert data["error"] == {
@@ -310,16 +313,11 @@ class TestSessionsApi(BaseSessionsMockTest, BaseApiTest):
             offset=1, partition=2, timestamp=datetime(1970, 1, 1)
         )
         template = {
+            **self.session_template,
             "session_id": "00000000-0000-0000-0000-000000000000",
             "distinct_id": "b3ef3211-58a4-4b36-a9a1-5a55df0d9aaf",
             "duration": None,
-            "environment": "production",
-            "org_id": 1,
             "project_id": project_id,
-            "release": "sentry-test@1.0.0",
-            "retention_days": settings.DEFAULT_RETENTION_DAYS,
-            "seq": 0,
-            "errors": 0,
             "received": datetime.utcnow().timestamp(),
             "started": self.started.timestamp(),
         }
@@ -364,7 +362,7 @@ class TestSessionsApi(BaseSessionsMockTest, BaseApiTest):
         self.generate_session_events(project_id)
         response = self.post(
             "/sessions/snql",
-            data=json.dumps(
+            data=rapidjson.dumps(
                 {
                     "query": f"""MATCH (sessions)
                     SELECT bucketed_started, users_errored, users_crashed, users, users_abnormal
@@ -382,7 +380,7 @@ class TestSessionsApi(BaseSessionsMockTest, BaseApiTest):
         )
 
         assert response.status_code == 200
-        result = json.loads(response.data)
+        result = rapidjson.loads(response.data)
         assert len(result["data"]) > 0
         assert "bucketed_started" in result["data"][0]
 
@@ -393,7 +391,7 @@ class TestSessionsApi(BaseSessionsMockTest, BaseApiTest):
         self.generate_session_events(project_id)
         response = self.post(
             "/sessions/snql",
-            data=json.dumps(
+            data=rapidjson.dumps(
                 {
                     "query": f"""MATCH (sessions)
                     SELECT bucketed_started, users_errored, users_crashed, users, users_abnormal
@@ -410,6 +408,6 @@ class TestSessionsApi(BaseSessionsMockTest, BaseApiTest):
         )
 
         assert response.status_code == 200
-        result = json.loads(response.data)
+        result = rapidjson.loads(response.data)
         assert len(result["data"]) > 0
         assert "bucketed_started" in result["data"][0]
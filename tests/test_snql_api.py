@@ -6,7 +6,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 import simplejson as json
 
-from snuba import state
+from snuba import querylog, state
 from snuba.datasets.entities import EntityKey
 from snuba.datasets.entities.factory import get_entity
 from snuba.datasets.storages import StorageKey
@@ -275,6 +275,42 @@ class TestSnQLApi(BaseApiTest):
             assert metadata["request"]["referrer"] == "test"
             assert len(metadata["query_list"]) == expected_query_count
 
+    @patch("snuba.settings.RECORD_QUERIES", True)
+    @patch("snuba.settings.RECORD_QUERIES_ASYNC", True)
+    @patch("snuba.state.record_queries")
+    def test_record_queries_async(self, record_queries_mock: MagicMock) -> None:
+        response = self.post(
+            "/events/snql",
+            data=json.dumps(
+                {
+                    "query": f"""MATCH (events)
+                    SELECT event_id, title, transaction, tags[a], tags[b], message, project_id
+                    WHERE timestamp >= toDateTime('{self.base_time.isoformat()}')
+                    AND timestamp < toDateTime('{self.next_time.isoformat()}')
+                    AND project_id IN tuple({self.project_id})
+                    LIMIT 5""",
+                }
+            ),
+        )
+        assert response.status_code == 200
+        querylog.emitter.flush()
+
+        assert record_queries_mock.call_count == 1
+        (queries,) = record_queries_mock.call_args[0]
+        assert len(queries) == 1
+        metadata = queries[0]
+        assert metadata["dataset"] == "events"
+        assert metadata["request"]["referrer"] == "test"
+        assert len(metadata["query_list"]) == 1
+
+        metric_calls = get_recorded_metric_calls("timing", "api.query")
+        assert metric_calls is not None
+        assert len(metric_calls) == 1
+        assert metric_calls[0].tags["status"] == "success"
+        assert metric_calls[0].tags["referrer"] == "test"
+        assert metric_calls[0].tags["final"] == "False"
+        assert metric_calls[0].tags["dataset"] == "events"
+
     @patch("snuba.settings.RECORD_QUERIES", True)
     @patch("snuba.state.record_query")
     @patch("snuba.web.db_query.execute_query_with_readthrough_caching")
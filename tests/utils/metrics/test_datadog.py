@@ -0,0 +1,38 @@
+from unittest.mock import call, create_autospec
+
+from datadog.dogstatsd.base import DogStatsd
+
+from snuba.utils.metrics.backends.datadog import DatadogMetricsBackend
+from snuba.utils.metrics.wrapper import MetricsWrapper
+
+
+def test_datadog_batch() -> None:
+    client = create_autospec(DogStatsd, instance=True)
+    backend = DatadogMetricsBackend(lambda: client)
+
+    backend.timing("unbatched", 1)
+    with backend.batch():
+        backend.timing("first", 2, tags={"key": "value"})
+        backend.timing("second", 3)
+
+    assert client.mock_calls == [
+        call.timing("unbatched", 1, tags=None, sample_rate=1.0),
+        call.__enter__(),
+        call.timing("first", 2, tags=["key:value"], sample_rate=1.0),
+        call.timing("second", 3, tags=None, sample_rate=1.0),
+        call.__exit__(None, None, None),
+    ]
+
+
+def test_wrapper_batch_forwards_to_backend() -> None:
+    client = create_autospec(DogStatsd, instance=True)
+    wrapper = MetricsWrapper(DatadogMetricsBackend(lambda: client), "api")
+
+    with wrapper.batch():
+        wrapper.timing("query", 1)
+
+    assert client.mock_calls == [
+        call.__enter__(),
+        call.timing("api.query", 1, tags=None, sample_rate=1.0),
+        call.__exit__(None, None, None),
+    ]
@@ -1,3 +1,5 @@
+import pytest
+
 from snuba.utils.clock import TestingClock
 from snuba.utils.metrics.timer import Timer
 from tests.backends.metrics import TestingMetricsBackend, Timing
@@ -60,3 +62,26 @@ def test_timer_send_metrics() -> None:
             "timer.thing2", 10.0 * 1000, {"mark-key": "mark-value", **overridden_tags}
         ),
     ]
+
+
+@pytest.mark.parametrize(
+    "duration, group",
+    [
+        (0.0, "<10s"),
+        (9.999, "<10s"),
+        (10.0, ">10s"),
+        (20.0, ">20s"),
+        (29.999, ">20s"),
+        (30.0, ">30s"),
+        (120.0, ">30s"),
+    ],
+)
+def test_timer_duration_group(duration: float, group: str) -> None:
+    time = TestingClock()
+    t = Timer("timer", clock=time)
+    assert t.get_duration_group() == "unknown"
+
+    time.sleep(duration)
+    t.mark("thing")
+    t.finish()
+    assert t.get_duration_group() == group